@@ -13,6 +13,14 @@ class Settings(BaseSettings):
     backend_url: str = "http://127.0.0.1:8000"
     google_client_id: str | None = None
     google_client_secret: str | None = None
+    chat_window_tokens: int = 1500
+    chat_window_turns: int = 12
+    chat_summary_max_tokens: int = 300
+    pallor_model_path: str | None = None
+    pallor_image_size: int = 64
+    pallor_batch_size: int = 32
+    pallor_batch_wait_ms: float = 5.0
+    pallor_max_batch_files: int = 64
 
     class Config:
         env_prefix = "HEMOSCAN_"
@@ -6,10 +6,18 @@ from starlette.middleware.sessions import SessionMiddleware
 from backend.app.routes import ai, auth, data, health
 from backend.app.config import settings
 from backend.app.services.db import get_client
+from backend.app.services.diet_catalog import load_catalog
+from backend.app.services.pallor import load_classifier
+from backend.app.services.repos import ChatSessionRepo
+from backend.app.services.serialization import JSONResponse
 
 logging.basicConfig(level=logging.INFO)
 
-app = FastAPI(title="HemoScan AI Backend", version="0.1.0")
+app = FastAPI(
+    title="HemoScan AI Backend",
+    version="0.1.0",
+    default_response_class=JSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,9 +36,26 @@ app.include_router(data.router, prefix="/api/data", tags=["data"])
 
 @app.on_event("startup")
 async def startup():
+    if settings.pallor_model_path:
+        try:
+            load_classifier()
+            logging.info("Pallor classifier loaded: %s", settings.pallor_model_path)
+        except Exception as exc:
+            logging.error("Pallor classifier load failed, screening disabled: %s", exc)
+
     client = get_client()
     try:
         await client.admin.command("ping")
         logging.info("MongoDB connected")
     except Exception as exc:
         logging.error("MongoDB connection failed: %s", exc)
+        return
+    try:
+        await ChatSessionRepo.ensure_indexes()
+    except Exception as exc:
+        logging.error("Chat index creation failed: %s", exc)
+    try:
+        count = await load_catalog()
+        logging.info("Diet catalog loaded: %d plan(s)", count)
+    except Exception as exc:
+        logging.error("Diet catalog load failed: %s", exc)
@@ -1,13 +1,46 @@
+import asyncio
 import io
+from datetime import datetime
 
-from fastapi import APIRouter, File, UploadFile, HTTPException
+from fastapi import APIRouter, Depends, File, Form, UploadFile, HTTPException
 from pdf2image import convert_from_bytes
 from PIL import Image
 from pydantic import BaseModel
 import pytesseract
 
 from backend.app.config import settings
+from backend.app.services.chat_memory import (
+    build_chat_prompt,
+    cap_summary,
+    cbc_context,
+    estimate_tokens,
+    rolling_summary_prompt,
+    summary_prompt,
+    token_ratio,
+    turns_to_fold,
+)
+from backend.app.services.diet_catalog import (
+    cache_plan,
+    catalog_key,
+    get_plan,
+    personalize_prompt,
+    plan_prompt,
+    translate_plan,
+    translate_prompt,
+)
+from backend.app.services.deps import get_current_user
 from backend.app.services.gemini_client import get_text_model, get_vision_model
+from backend.app.services.pallor import (
+    ClassifierUnavailable,
+    InvalidImage,
+    decode_image,
+    decode_images,
+    get_batcher,
+    parse_crop,
+    screen_batch,
+)
+from backend.app.services.repos import CBCReportRepo, ChatSessionRepo
+from backend.app.services.serialization import JSONResponse
 
 router = APIRouter()
 
@@ -16,6 +49,10 @@ class ChatRequest(BaseModel):
     message: str
 
 
+class ChatTurnRequest(BaseModel):
+    message: str
+
+
 class SummaryRequest(BaseModel):
     context: str
 
@@ -23,6 +60,7 @@ class SummaryRequest(BaseModel):
 class DietRequest(BaseModel):
     diet_type: str
     notes: str | None = None
+    language: str = "English"
 
 
 class TranslateRequest(BaseModel):
@@ -42,11 +80,7 @@ def _require_gemini():
 def chat(payload: ChatRequest):
     _require_gemini()
     model = get_text_model()
-    prompt = (
-        "You are HemoScan AI. Provide clear, concise responses. "
-        "Do not diagnose; suggest seeing a clinician for medical advice.\n\n"
-        f"User: {payload.message}"
-    )
+    prompt = build_chat_prompt(payload.message)
     response = model.generate_content(
         prompt,
         generation_config={"temperature": settings.gemini_temperature},
@@ -54,15 +88,124 @@ def chat(payload: ChatRequest):
     return {"reply": response.text.strip()}
 
 
+def _generate(prompt: str):
+    model = get_text_model()
+    return model.generate_content(
+        prompt,
+        generation_config={"temperature": settings.gemini_temperature},
+    )
+
+
+def _measured_prompt_tokens(response) -> int | None:
+    usage = getattr(response, "usage_metadata", None)
+    return getattr(usage, "prompt_token_count", None) if usage else None
+
+
+async def _get_session(session_id: str, user: str) -> dict:
+    if not user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    session = await ChatSessionRepo.find(session_id, user)
+    if not session:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    return session
+
+
+@router.post("/chat/sessions")
+async def create_chat_session(user=Depends(get_current_user)):
+    if not user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    result = await ChatSessionRepo.create(
+        {
+            "user_email": user,
+            "summary": "",
+            "summarized_turns": 0,
+            "turn_count": 0,
+            "token_ratio": 1.0,
+            "created_at": datetime.utcnow(),
+        }
+    )
+    return {"status": "ok", "session_id": str(result.inserted_id)}
+
+
+@router.get("/chat/sessions/{session_id}")
+async def get_chat_session(session_id: str, user=Depends(get_current_user)):
+    session = await _get_session(session_id, user)
+    return JSONResponse(
+        {
+            "session_id": session["_id"],
+            "summary": session.get("summary", ""),
+            "summarized_turns": session.get("summarized_turns", 0),
+            "turns": await ChatSessionRepo.list_turns(session["_id"]),
+        }
+    )
+
+
+@router.post("/chat/sessions/{session_id}")
+async def chat_session_turn(
+    session_id: str, payload: ChatTurnRequest, user=Depends(get_current_user)
+):
+    session = await _get_session(session_id, user)
+    _require_gemini()
+
+    summary = session.get("summary", "")
+    summarized = session.get("summarized_turns", 0)
+    ratio = session.get("token_ratio", 1.0)
+    window = await ChatSessionRepo.list_turns(session["_id"], start=summarized)
+    next_index = window[-1]["index"] + 1 if window else summarized
+    reports = await CBCReportRepo.list_by_user(user, limit=1)
+    cbc = cbc_context(reports[0] if reports else None)
+
+    fold = turns_to_fold(window, payload.message, summary, cbc, ratio)
+    if fold:
+        response = await asyncio.to_thread(
+            _generate, rolling_summary_prompt(summary, window[:fold])
+        )
+        summary = cap_summary(response.text.strip(), ratio)
+        summarized += fold
+        window = window[fold:]
+
+    prompt = build_chat_prompt(payload.message, summary=summary, turns=window, cbc=cbc)
+    response = await asyncio.to_thread(_generate, prompt)
+    reply = response.text.strip()
+    measured = _measured_prompt_tokens(response)
+    prompt_tokens = measured or estimate_tokens(prompt, ratio)
+    ratio = token_ratio(ratio, measured, prompt)
+
+    now = datetime.utcnow()
+    saved = await ChatSessionRepo.append_turns(
+        session,
+        next_index,
+        [
+            {"role": "user", "text": payload.message, "created_at": now},
+            {
+                "role": "assistant",
+                "text": reply,
+                "created_at": now,
+                "prompt_tokens": prompt_tokens,
+            },
+        ],
+        summary,
+        summarized,
+        ratio,
+    )
+    if not saved:
+        raise HTTPException(
+            status_code=409,
+            detail="Chat session was updated by another request; resend the message",
+        )
+    return {
+        "reply": reply,
+        "prompt_tokens": prompt_tokens,
+        "window_turns": len(window),
+        "summarized_turns": summarized,
+    }
+
+
 @router.post("/summary")
 def summary(payload: SummaryRequest):
     _require_gemini()
     model = get_text_model()
-    prompt = (
-        "Summarize the clinical context clearly and concisely. "
-        "Do not add new facts.\n\n"
-        f"Context: {payload.context}"
-    )
+    prompt = summary_prompt(payload.context)
     response = model.generate_content(
         prompt,
         generation_config={"temperature": settings.gemini_temperature},
@@ -72,29 +215,38 @@ def summary(payload: SummaryRequest):
 
 @router.post("/diet")
 def diet(payload: DietRequest):
-    prompt = (
-        f"Create a practical, budget-friendly diet plan for a {payload.diet_type} diet. "
-        "Focus on iron-rich foods and include 3 meal ideas plus 3 snack ideas."
-    )
-    if payload.notes:
-        prompt += f" Notes: {payload.notes}"
+    diet_type, language = catalog_key(payload.diet_type, payload.language)
+    base = get_plan(diet_type, language)
+    if base and not payload.notes:
+        return {"plan": base, "source": "catalog"}
+
+    english = get_plan(diet_type, "English")
+    if not base and english and not payload.notes:
+        # Language missing from the catalog: translate the catalog's English
+        # plan so the content matches what English readers get.
+        _require_gemini()
+        plan = translate_plan(english, language)
+        cache_plan(diet_type, language, plan)
+        return {"plan": plan, "source": "catalog"}
+
+    if base:
+        prompt = personalize_prompt(base, payload.notes, language)
+    else:
+        prompt = plan_prompt(diet_type, language, payload.notes)
     _require_gemini()
     model = get_text_model()
     response = model.generate_content(
         prompt,
         generation_config={"temperature": settings.gemini_temperature},
     )
-    return {"plan": response.text.strip()}
+    return {"plan": response.text.strip(), "source": "personalized" if base else "generated"}
 
 
 @router.post("/translate")
 def translate(payload: TranslateRequest):
     _require_gemini()
     model = get_text_model()
-    prompt = (
-        "Translate the text to the target language. Return only the translated text.\n\n"
-        f"Target language: {payload.target_language}\nText: {payload.text}"
-    )
+    prompt = translate_prompt(payload.text, payload.target_language)
     response = model.generate_content(
         prompt,
         generation_config={"temperature": settings.gemini_temperature},
@@ -151,3 +303,53 @@ async def ocr(file: UploadFile = File(...)):
         return {"text": ocr_image_tesseract(image), "method": "tesseract"}
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"OCR failed: {exc}")
+
+
+async def _read_upload(file: UploadFile) -> bytes:
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No file uploaded")
+    return await file.read()
+
+
+async def _run_screening(coro):
+    try:
+        return await coro
+    except ClassifierUnavailable as exc:
+        raise HTTPException(status_code=503, detail=f"Pallor classifier unavailable: {exc}")
+
+
+def _crop_box(crop: str | None):
+    try:
+        return parse_crop(crop)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid crop: {exc}")
+
+
+@router.post("/screen")
+async def screen(file: UploadFile = File(...), crop: str | None = Form(None)):
+    box = _crop_box(crop)
+    content = await _read_upload(file)
+    try:
+        image = await asyncio.to_thread(decode_image, content, box)
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid image {file.filename}: {exc}")
+    return await _run_screening(get_batcher().submit(image))
+
+
+@router.post("/screen/batch")
+async def screen_many(files: list[UploadFile] = File(...), crop: str | None = Form(None)):
+    if len(files) > settings.pallor_max_batch_files:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files; maximum is {settings.pallor_max_batch_files}",
+        )
+    box = _crop_box(crop)
+    contents = [await _read_upload(file) for file in files]
+    try:
+        images = await asyncio.to_thread(decode_images, contents, box)
+    except InvalidImage as exc:
+        raise HTTPException(
+            status_code=400, detail=f"Invalid image {files[exc.index].filename}: {exc}"
+        )
+    results = await _run_screening(asyncio.to_thread(screen_batch, images))
+    return {"items": results}
@@ -13,10 +13,11 @@ from backend.app.services.auth import (
     decode_token,
     hash_password,
     hash_token,
-    refresh_token_expiry_iso,
+    refresh_token_expiry,
     verify_password,
 )
 from backend.app.services.repos import UserRepo
+from backend.app.services.serialization import parse_datetime
 from backend.app.config import settings
 
 router = APIRouter()
@@ -78,7 +79,7 @@ async def login(payload: LoginRequest):
     access_token = create_access_token(payload.email)
     refresh_token = create_refresh_token(payload.email)
     await UserRepo.set_refresh_token(
-        payload.email, hash_token(refresh_token), refresh_token_expiry_iso()
+        payload.email, hash_token(refresh_token), refresh_token_expiry()
     )
     return {
         "token": access_token,
@@ -102,14 +103,13 @@ async def refresh(payload: RefreshRequest):
     token_hash = hash_token(payload.refresh_token)
     if user.get("refresh_token_hash") != token_hash:
         raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
-    expires_at = user.get("refresh_token_expires_at")
+    expires_at = parse_datetime(user.get("refresh_token_expires_at"))
     if expires_at:
-        expires_dt = datetime.fromisoformat(expires_at.replace("Z", ""))
-        if expires_dt < datetime.utcnow():
+        if expires_at < datetime.utcnow():
             raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
     access_token = create_access_token(email)
     new_refresh = create_refresh_token(email)
-    await UserRepo.set_refresh_token(email, hash_token(new_refresh), refresh_token_expiry_iso())
+    await UserRepo.set_refresh_token(email, hash_token(new_refresh), refresh_token_expiry())
     return {"token": access_token, "refresh_token": new_refresh}
 
 
@@ -136,7 +136,7 @@ async def password_reset(_: PasswordResetRequest):
 
     raw_token = secrets.token_urlsafe(32)
     token_hash = hashlib.sha256(raw_token.encode("utf-8")).hexdigest()
-    expires_at = (datetime.utcnow() + timedelta(hours=1)).isoformat() + "Z"
+    expires_at = datetime.utcnow() + timedelta(hours=1)
     await UserRepo.set_reset_token(_.email, token_hash, expires_at)
 
     # NOTE: For production, email the token instead of returning it.
@@ -149,11 +149,10 @@ async def password_reset_confirm(_: PasswordResetConfirmRequest):
     user = await UserRepo.find_by_reset_token(token_hash)
     if not user:
         raise HTTPException(status_code=400, detail="Invalid or expired token")
-    expires_at = user.get("reset_token_expires_at")
+    expires_at = parse_datetime(user.get("reset_token_expires_at"))
     if not expires_at:
         raise HTTPException(status_code=400, detail="Invalid or expired token")
-    expires_dt = datetime.fromisoformat(expires_at.replace("Z", ""))
-    if expires_dt < datetime.utcnow():
+    if expires_at < datetime.utcnow():
         raise HTTPException(status_code=400, detail="Invalid or expired token")
 
     await UserRepo.update_password(user["email"], hash_password(_.new_password))
@@ -187,7 +186,7 @@ async def google_callback(request: Request):
 
     access_token = create_access_token(email)
     refresh_token = create_refresh_token(email)
-    await UserRepo.set_refresh_token(email, hash_token(refresh_token), refresh_token_expiry_iso())
+    await UserRepo.set_refresh_token(email, hash_token(refresh_token), refresh_token_expiry())
 
     redirect_url = (
         f"{settings.frontend_url}/auth/google/callback"
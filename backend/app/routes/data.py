@@ -5,6 +5,7 @@ from pydantic import BaseModel, EmailStr, Field
 
 from backend.app.services.deps import get_current_user
 from backend.app.services.repos import CBCReportRepo, SymptomRepo
+from backend.app.services.serialization import JSONResponse
 
 router = APIRouter()
 
@@ -33,7 +34,7 @@ async def create_cbc(payload: CBCCreateRequest, user=Depends(get_current_user)):
         raise HTTPException(status_code=401, detail="Unauthorized")
     data = payload.model_dump()
     data["user_email"] = user
-    data["created_at"] = datetime.utcnow().isoformat() + "Z"
+    data["created_at"] = datetime.utcnow()
     result = await CBCReportRepo.create(data)
     return {"status": "ok", "id": str(result.inserted_id)}
 
@@ -45,7 +46,7 @@ async def list_cbc(email: str, user=Depends(get_current_user)):
     if email != user:
         raise HTTPException(status_code=403, detail="Forbidden")
     items = await CBCReportRepo.list_by_user(email)
-    return {"items": items}
+    return JSONResponse({"items": items})
 
 
 @router.post("/symptoms")
@@ -54,7 +55,7 @@ async def create_symptom(payload: SymptomCreateRequest, user=Depends(get_current
         raise HTTPException(status_code=401, detail="Unauthorized")
     data = payload.model_dump()
     data["user_email"] = user
-    data["created_at"] = datetime.utcnow().isoformat() + "Z"
+    data["created_at"] = datetime.utcnow()
     result = await SymptomRepo.create(data)
     return {"status": "ok", "id": str(result.inserted_id)}
 
@@ -66,4 +67,4 @@ async def list_symptoms(email: str, user=Depends(get_current_user)):
     if email != user:
         raise HTTPException(status_code=403, detail="Forbidden")
     items = await SymptomRepo.list_by_user(email)
-    return {"items": items}
+    return JSONResponse({"items": items})
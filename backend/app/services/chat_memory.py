@@ -0,0 +1,136 @@
+from datetime import datetime
+
+from backend.app.config import settings
+
+CHAT_PREAMBLE = (
+    "You are HemoScan AI. Provide clear, concise responses. "
+    "Do not diagnose; suggest seeing a clinician for medical advice."
+)
+
+_CBC_FIELDS = (
+    ("hemoglobin", "Hemoglobin", "g/dL"),
+    ("rbc", "RBC", "million/uL"),
+    ("hematocrit", "Hematocrit", "%"),
+    ("mcv", "MCV", "fL"),
+    ("mch", "MCH", "pg"),
+    ("mchc", "MCHC", "g/dL"),
+    ("rdw", "RDW", "%"),
+    ("wbc", "WBC", "thousand/uL"),
+    ("platelets", "Platelets", "thousand/uL"),
+)
+
+_ROLE_LABELS = {"user": "User", "assistant": "HemoScan AI"}
+
+
+def estimate_tokens(text: str, ratio: float = 1.0) -> int:
+    # Roughly four UTF-8 bytes per token. Counting bytes rather than characters
+    # keeps Hindi, Tamil, Telugu and Arabic from being undercounted; `ratio`
+    # is the session's measured real/estimated correction (see token_ratio).
+    # Avoids a network round trip to count_tokens on every turn.
+    return int(len(text.encode("utf-8")) / 4 * ratio) + 1
+
+
+def token_ratio(previous: float, measured: int | None, prompt: str) -> float:
+    # Exponential moving average of real/estimated prompt tokens, clamped so a
+    # single odd measurement cannot swing the budget too far.
+    if not measured:
+        return previous
+    observed = measured / estimate_tokens(prompt)
+    return round(min(max(0.7 * previous + 0.3 * observed, 0.25), 4.0), 3)
+
+
+def summary_prompt(context: str) -> str:
+    return (
+        "Summarize the clinical context clearly and concisely. "
+        "Do not add new facts.\n\n"
+        f"Context: {context}"
+    )
+
+
+def format_turns(turns: list[dict]) -> str:
+    return "\n".join(f"{_ROLE_LABELS.get(t['role'], t['role'])}: {t['text']}" for t in turns)
+
+
+def rolling_summary_prompt(summary: str, turns: list[dict]) -> str:
+    context = format_turns(turns)
+    if summary:
+        context = f"Earlier summary: {summary}\nNew conversation:\n{context}"
+    # Roughly three words per four tokens.
+    words = settings.chat_summary_max_tokens * 3 // 4
+    return summary_prompt(context) + f"\n\nKeep the summary under {words} words."
+
+
+def cap_summary(summary: str, ratio: float = 1.0) -> str:
+    tokens = estimate_tokens(summary, ratio)
+    if tokens <= settings.chat_summary_max_tokens:
+        return summary
+    limit = len(summary) * settings.chat_summary_max_tokens // tokens
+    return summary[:limit].rsplit(" ", 1)[0] + " ..."
+
+
+def cbc_context(report: dict | None) -> str:
+    if not report:
+        return ""
+    values = [
+        f"{label} {report[key]} {unit}"
+        for key, label, unit in _CBC_FIELDS
+        if report.get(key) is not None
+    ]
+    if not values:
+        return ""
+    when = report.get("report_date") or report.get("created_at") or "unknown date"
+    if isinstance(when, datetime):
+        when = when.date().isoformat()
+    return f"Latest CBC report ({when}): " + ", ".join(values) + "."
+
+
+def turns_to_fold(
+    turns: list[dict],
+    message: str,
+    summary: str = "",
+    cbc: str = "",
+    ratio: float = 1.0,
+) -> int:
+    # Number of oldest unsummarized turns to move into the summary. Nothing is
+    # folded while the whole prompt fits the budget; once it overflows, the
+    # window is folded down to half the budget so summarization runs every few
+    # exchanges instead of on every turn.
+    budget = settings.chat_window_tokens - (
+        estimate_tokens(message, ratio)
+        + estimate_tokens(summary, ratio)
+        + estimate_tokens(cbc, ratio)
+    )
+    sizes = [estimate_tokens(t["text"], ratio) for t in turns]
+    total = sum(sizes)
+    if total <= budget and len(turns) <= settings.chat_window_turns:
+        return 0
+
+    target_tokens = budget // 2
+    target_turns = settings.chat_window_turns // 2
+    count = 0
+    while count < len(turns) and (
+        total > target_tokens or len(turns) - count > target_turns
+    ):
+        total -= sizes[count]
+        count += 1
+    # Fold whole user/assistant exchanges so the window never starts mid-reply.
+    if count % 2:
+        count = min(count + 1, len(turns))
+    return count
+
+
+def build_chat_prompt(
+    message: str,
+    summary: str = "",
+    turns: list[dict] | None = None,
+    cbc: str = "",
+) -> str:
+    parts = [CHAT_PREAMBLE]
+    if cbc:
+        parts.append(cbc)
+    if summary:
+        parts.append(f"Conversation summary so far: {summary}")
+    if turns:
+        parts.append(format_turns(turns))
+    parts.append(f"User: {message}")
+    return "\n\n".join(parts)
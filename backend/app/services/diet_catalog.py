@@ -0,0 +1,152 @@
+import argparse
+import asyncio
+import logging
+from datetime import datetime
+
+from backend.app.config import settings
+from backend.app.services.gemini_client import get_text_model
+from backend.app.services.repos import DietPlanRepo
+
+DIET_TYPES = {
+    "veg": ("vegetarian", "Focus on lentils, spinach, tofu, and vitamin C sources."),
+    "nonveg": (
+        "non-vegetarian",
+        "Prioritize lean red meat, eggs, and leafy greens with vitamin C.",
+    ),
+    "vegan": (
+        "vegan",
+        "Focus on legumes, tofu, leafy greens, seeds, and vitamin C sources.",
+    ),
+}
+LANGUAGES = ("English", "Hindi", "Tamil", "Telugu", "Spanish", "Arabic")
+
+_catalog: dict[tuple[str, str], str] = {}
+
+
+def catalog_key(diet_type: str, language: str) -> tuple[str, str]:
+    language = language.strip().lower()
+    for supported in LANGUAGES:
+        if supported.lower() == language:
+            language = supported
+            break
+    return diet_type.strip().lower().replace("-", ""), language
+
+
+def plan_prompt(diet_type: str, language: str = "English", notes: str | None = None) -> str:
+    label, focus = DIET_TYPES.get(diet_type, (diet_type, ""))
+    prompt = (
+        f"Create a practical, budget-friendly diet plan for a {label} diet. "
+        "Focus on iron-rich foods and include 3 meal ideas plus 3 snack ideas."
+    )
+    if focus:
+        prompt += f" {focus}"
+    if language != "English":
+        prompt += f" Write the plan in {language}."
+    if notes:
+        prompt += f" Notes: {notes}"
+    return prompt
+
+
+def personalize_prompt(plan: str, notes: str, language: str = "English") -> str:
+    return (
+        "Adjust this iron-focused diet plan to the notes below. Keep the same structure, "
+        f"change only what the notes require, and reply in {language}.\n\n"
+        f"Notes: {notes}\n\nPlan:\n{plan}"
+    )
+
+
+def translate_prompt(text: str, language: str) -> str:
+    return (
+        "Translate the text to the target language. Return only the translated text.\n\n"
+        f"Target language: {language}\nText: {text}"
+    )
+
+
+def get_plan(diet_type: str, language: str) -> str | None:
+    return _catalog.get(catalog_key(diet_type, language))
+
+
+def cache_plan(diet_type: str, language: str, plan: str) -> None:
+    _catalog[catalog_key(diet_type, language)] = plan
+
+
+async def load_catalog() -> int:
+    items = await DietPlanRepo.list_all()
+    _catalog.clear()
+    for item in items:
+        _catalog[(item["diet_type"], item["language"])] = item["plan"]
+    return len(_catalog)
+
+
+def _generate(prompt: str, temperature: float) -> str:
+    model = get_text_model()
+    response = model.generate_content(
+        prompt,
+        generation_config={"temperature": temperature},
+    )
+    return response.text.strip()
+
+
+def translate_plan(plan: str, language: str) -> str:
+    # Deterministic, so every language lists the same meals as the English plan.
+    return _generate(translate_prompt(plan, language), temperature=0)
+
+
+async def _store(diet_type: str, language: str, plan: str) -> None:
+    await DietPlanRepo.upsert(
+        {
+            "diet_type": diet_type,
+            "language": language,
+            "plan": plan,
+            "updated_at": datetime.utcnow(),
+        }
+    )
+
+
+async def build_catalog(refresh: bool = False) -> int:
+    # One English plan per diet type; every other language is a translation of
+    # that text. A regenerated English plan invalidates its translations.
+    existing = {
+        (item["diet_type"], item["language"]): item["plan"]
+        for item in await DietPlanRepo.list_all()
+    }
+    built = 0
+    for diet_type in DIET_TYPES:
+        english = existing.get((diet_type, "English"))
+        regenerate = refresh or english is None
+        if regenerate:
+            english = await asyncio.to_thread(
+                _generate, plan_prompt(diet_type), settings.gemini_temperature
+            )
+            await _store(diet_type, "English", english)
+            logging.info("Diet plan generated: %s/English", diet_type)
+            built += 1
+        for language in LANGUAGES:
+            if language == "English":
+                continue
+            if not regenerate and (diet_type, language) in existing:
+                continue
+            plan = await asyncio.to_thread(translate_plan, english, language)
+            await _store(diet_type, language, plan)
+            logging.info("Diet plan translated: %s/%s", diet_type, language)
+            built += 1
+    return built
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the precomputed diet plan catalog.")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Regenerate every plan instead of only the missing ones.",
+    )
+    args = parser.parse_args()
+    if not settings.gemini_api_key:
+        raise SystemExit("Gemini API key not configured. Set HEMOSCAN_GEMINI_API_KEY.")
+    logging.basicConfig(level=logging.INFO)
+    built = asyncio.run(build_catalog(refresh=args.refresh))
+    logging.info("Diet catalog ready: %d plan(s) generated", built)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import asyncio
+import logging
+
+from pymongo import UpdateOne
+
+from backend.app.services.db import get_db
+from backend.app.services.serialization import parse_datetime
+
+DATETIME_FIELDS = {
+    "users": ("created_at", "reset_token_expires_at", "refresh_token_expires_at"),
+    "cbc_reports": ("created_at",),
+    "symptoms": ("created_at",),
+    "chat_sessions": ("created_at",),
+    "diet_plans": ("updated_at",),
+}
+
+_BATCH_SIZE = 500
+
+
+async def _migrate_field(collection, field: str, dry_run: bool) -> int:
+    cursor = collection.find({field: {"$type": "string"}}, {field: 1})
+    converted = 0
+    batch = []
+    async for doc in cursor:
+        batch.append(
+            UpdateOne(
+                {"_id": doc["_id"], field: doc[field]},
+                {"$set": {field: parse_datetime(doc[field])}},
+            )
+        )
+        if len(batch) >= _BATCH_SIZE:
+            if not dry_run:
+                await collection.bulk_write(batch, ordered=False)
+            converted += len(batch)
+            batch = []
+    if batch:
+        if not dry_run:
+            await collection.bulk_write(batch, ordered=False)
+        converted += len(batch)
+    return converted
+
+
+async def migrate(dry_run: bool = False) -> int:
+    db = get_db()
+    total = 0
+    for name, fields in DATETIME_FIELDS.items():
+        for field in fields:
+            converted = await _migrate_field(db[name], field, dry_run)
+            if converted:
+                logging.info("%s.%s: %d ISO string(s) converted", name, field, converted)
+            total += converted
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert ISO datetime strings in stored documents to BSON dates."
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only count the documents that would be converted.",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    total = asyncio.run(migrate(dry_run=args.dry_run))
+    logging.info(
+        "Datetime migration %s: %d value(s)",
+        "dry run" if args.dry_run else "done",
+        total,
+    )
+
+
+if __name__ == "__main__":
+    main()
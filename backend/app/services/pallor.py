@@ -0,0 +1,290 @@
+import asyncio
+import io
+
+import numpy as np
+from PIL import Image
+
+from backend.app.config import settings
+
+FEATURE_NAMES = (
+    "erythema_index",
+    "red_ratio",
+    "redness",
+    "saturation",
+    "brightness",
+    "coverage",
+)
+
+# Rough screening thresholds for the heuristic fallback; replace with a
+# calibrated classifier via HEMOSCAN_PALLOR_MODEL_PATH when one is available.
+# Heuristic scores are never mapped to a risk level.
+_HEURISTIC_EI_CENTER = 0.35
+_HEURISTIC_EI_SLOPE = 12.0
+_RISK_THRESHOLDS = (0.35, 0.65)
+
+# Inner-eyelid tissue is red-dominant with a hue close to pure red; brown iris
+# and most skin tones sit further towards orange. Frames where too little of
+# the image looks like conjunctiva are rejected instead of scored.
+_TISSUE_MAX_HUE = 20.0
+_TISSUE_MIN_SATURATION = 0.08
+_MIN_COVERAGE = 0.15
+
+DISCLAIMER = (
+    "Screening aid only, not a diagnosis. Confirm with a CBC test and a clinician."
+)
+
+_EPS = 1.0 / 255.0
+
+_classifier = None
+_classifier_loaded = False
+_batcher = None
+
+
+class ClassifierUnavailable(RuntimeError):
+    pass
+
+
+class InvalidImage(ValueError):
+    def __init__(self, index: int, error: Exception):
+        super().__init__(str(error))
+        self.index = index
+
+
+def parse_crop(value: str | None) -> tuple[float, float, float, float] | None:
+    # "left,top,right,bottom" as fractions of the image size.
+    if not value:
+        return None
+    box = tuple(float(part) for part in value.split(","))
+    if len(box) != 4:
+        raise ValueError("crop must be 'left,top,right,bottom'")
+    left, top, right, bottom = box
+    if not (0.0 <= left < right <= 1.0 and 0.0 <= top < bottom <= 1.0):
+        raise ValueError("crop fractions must be ordered and within 0..1")
+    return box
+
+
+def decode_image(
+    content: bytes, crop: tuple[float, float, float, float] | None = None
+) -> np.ndarray:
+    size = settings.pallor_image_size
+    image = Image.open(io.BytesIO(content))
+    # Let the JPEG decoder downscale while decoding instead of after; the crop
+    # is fractional, so it does not depend on the decoded resolution.
+    image.draft("RGB", (size * 4, size * 4) if crop else (size * 2, size * 2))
+    image = image.convert("RGB")
+    if crop:
+        width, height = image.size
+        left, top, right, bottom = crop
+        image = image.crop(
+            (int(left * width), int(top * height), int(right * width), int(bottom * height))
+        )
+    image = image.resize((size, size), Image.BILINEAR)
+    return np.asarray(image, dtype=np.uint8)
+
+
+def decode_images(
+    contents: list[bytes], crop: tuple[float, float, float, float] | None = None
+) -> list[np.ndarray]:
+    images = []
+    for index, content in enumerate(contents):
+        try:
+            images.append(decode_image(content, crop))
+        except Exception as exc:
+            raise InvalidImage(index, exc) from exc
+    return images
+
+
+def extract_features(images: np.ndarray) -> np.ndarray:
+    batch = images.shape[0]
+    rgb = images.reshape(batch, -1, 3).astype(np.float32) * (1.0 / 255.0)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+
+    value = rgb.max(axis=-1)
+    chroma = value - rgb.min(axis=-1)
+    saturation = chroma / np.maximum(value, _EPS)
+
+    # Keep only red-dominant, red-hued pixels (conjunctival tissue). This drops
+    # lashes/pupil, sclera/glare, and most iris and periorbital skin.
+    red_max = (r >= g) & (r >= b)
+    hue = 60.0 * (g - b) / np.maximum(chroma, _EPS)
+    mask = (
+        red_max
+        & (np.abs(hue) <= _TISSUE_MAX_HUE)
+        & (saturation >= _TISSUE_MIN_SATURATION)
+        & (value > 0.15)
+    )
+    weight = mask.astype(np.float32)
+    count = weight.sum(axis=1)
+    denom = np.maximum(count, 1.0)
+
+    def masked_mean(values: np.ndarray) -> np.ndarray:
+        return (values * weight).sum(axis=1) / denom
+
+    r_safe = np.maximum(r, _EPS)
+    g_safe = np.maximum(g, _EPS)
+    features = np.stack(
+        [
+            masked_mean(np.log(r_safe) - np.log(g_safe)),
+            masked_mean(r / np.maximum(r + g + b, _EPS)),
+            masked_mean((r - g) / np.maximum(r + g, _EPS)),
+            masked_mean(saturation),
+            masked_mean(value),
+            count / rgb.shape[1],
+        ],
+        axis=1,
+    )
+    return features.astype(np.float32)
+
+
+def load_classifier():
+    global _classifier, _classifier_loaded
+    if _classifier_loaded:
+        return _classifier
+    if not settings.pallor_model_path:
+        _classifier_loaded = True
+        return None
+
+    # Expected layout: feature "mean"/"std", then per layer an int8 "w{i}",
+    # a per-output "scale{i}" and a float "b{i}". Weights are dequantized once.
+    # A configured model that fails to load raises on every call rather than
+    # silently degrading to the uncalibrated heuristic.
+    try:
+        with np.load(settings.pallor_model_path) as data:
+            layers = []
+            index = 0
+            while f"w{index}" in data:
+                weights = data[f"w{index}"].astype(np.float32) * data[
+                    f"scale{index}"
+                ].astype(np.float32)
+                layers.append((weights, data[f"b{index}"].astype(np.float32)))
+                index += 1
+            if not layers:
+                raise ValueError("model has no layers")
+            classifier = (
+                data["mean"].astype(np.float32),
+                data["std"].astype(np.float32),
+                layers,
+            )
+    except Exception as exc:
+        raise ClassifierUnavailable(
+            f"cannot load {settings.pallor_model_path}: {exc}"
+        ) from exc
+    _classifier = classifier
+    _classifier_loaded = True
+    return _classifier
+
+
+def _sigmoid(values: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-values))
+
+
+def predict(features: np.ndarray) -> tuple[np.ndarray, str]:
+    classifier = load_classifier()
+    if classifier is None:
+        scores = _sigmoid(_HEURISTIC_EI_SLOPE * (_HEURISTIC_EI_CENTER - features[:, 0]))
+        return scores, "heuristic"
+
+    mean, std, layers = classifier
+    hidden = (features - mean) / std
+    for index, (weights, bias) in enumerate(layers):
+        hidden = hidden @ weights + bias
+        if index < len(layers) - 1:
+            np.maximum(hidden, 0.0, out=hidden)
+    return _sigmoid(hidden.reshape(len(features), -1)[:, 0]), "classifier"
+
+
+def _risk_level(score: float) -> str:
+    low, high = _RISK_THRESHOLDS
+    if score < low:
+        return "low"
+    if score < high:
+        return "moderate"
+    return "high"
+
+
+def screen_batch(images: list[np.ndarray]) -> list[dict]:
+    if not images:
+        return []
+    features = extract_features(np.stack(images))
+    scores, method = predict(features)
+    calibrated = method == "classifier"
+    coverage_index = FEATURE_NAMES.index("coverage")
+    results = []
+    for row, score in zip(features.tolist(), scores.tolist()):
+        result = {
+            "status": "ok",
+            "method": method,
+            "calibrated": calibrated,
+            "disclaimer": DISCLAIMER,
+            "features": {name: round(value, 4) for name, value in zip(FEATURE_NAMES, row)},
+        }
+        if row[coverage_index] < _MIN_COVERAGE:
+            result["status"] = "rejected"
+            result["detail"] = (
+                "Too little conjunctiva in frame. Pull down the lower eyelid and crop "
+                "to the inner eyelid, or pass a crop box."
+            )
+        else:
+            result["pallor_score"] = round(score, 4)
+            if calibrated:
+                result["anemia_risk"] = _risk_level(score)
+        results.append(result)
+    return results
+
+
+class MicroBatcher:
+    def __init__(self, handler, max_size: int, max_wait_ms: float):
+        self._handler = handler
+        self._max_size = max_size
+        self._max_wait = max_wait_ms / 1000.0
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+
+    async def submit(self, item):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait
+            while len(pending) < self._max_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            items = [item for item, _ in pending]
+            try:
+                results = await asyncio.to_thread(self._handler, items)
+                if len(results) != len(pending):
+                    raise RuntimeError(
+                        f"batch handler returned {len(results)} results for {len(pending)} items"
+                    )
+            except Exception as exc:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, future), result in zip(pending, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+def get_batcher() -> MicroBatcher:
+    global _batcher
+    if _batcher is None:
+        _batcher = MicroBatcher(
+            screen_batch,
+            max_size=settings.pallor_batch_size,
+            max_wait_ms=settings.pallor_batch_wait_ms,
+        )
+    return _batcher
@@ -1,12 +1,10 @@
-from backend.app.services.db import get_db
+from datetime import datetime
 
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo.errors import DuplicateKeyError
 
-def _serialize(doc: dict) -> dict:
-    if not doc:
-        return doc
-    if "_id" in doc:
-        doc["_id"] = str(doc["_id"])
-    return doc
+from backend.app.services.db import get_db
 
 
 class UserRepo:
@@ -18,10 +16,10 @@ class UserRepo:
     @staticmethod
     async def find_by_email(email: str):
         db = get_db()
-        return _serialize(await db.users.find_one({"email": email}))
+        return await db.users.find_one({"email": email})
 
     @staticmethod
-    async def set_reset_token(email: str, token_hash: str, expires_at: str):
+    async def set_reset_token(email: str, token_hash: str, expires_at: datetime):
         db = get_db()
         return await db.users.update_one(
             {"email": email},
@@ -31,7 +29,7 @@ class UserRepo:
     @staticmethod
     async def find_by_reset_token(token_hash: str):
         db = get_db()
-        return _serialize(await db.users.find_one({"reset_token_hash": token_hash}))
+        return await db.users.find_one({"reset_token_hash": token_hash})
 
     @staticmethod
     async def clear_reset_token(email: str):
@@ -50,7 +48,7 @@ class UserRepo:
         )
 
     @staticmethod
-    async def set_refresh_token(email: str, token_hash: str, expires_at: str):
+    async def set_refresh_token(email: str, token_hash: str, expires_at: datetime):
         db = get_db()
         return await db.users.update_one(
             {"email": email},
@@ -76,8 +74,7 @@ class CBCReportRepo:
     async def list_by_user(email: str, limit: int = 10):
         db = get_db()
         cursor = db.cbc_reports.find({"user_email": email}).sort("created_at", -1).limit(limit)
-        items = await cursor.to_list(length=limit)
-        return [_serialize(item) for item in items]
+        return await cursor.to_list(length=limit)
 
 
 class SymptomRepo:
@@ -90,5 +87,87 @@ class SymptomRepo:
     async def list_by_user(email: str, limit: int = 10):
         db = get_db()
         cursor = db.symptoms.find({"user_email": email}).sort("created_at", -1).limit(limit)
-        items = await cursor.to_list(length=limit)
-        return [_serialize(item) for item in items]
+        return await cursor.to_list(length=limit)
+
+
+class ChatSessionRepo:
+    @staticmethod
+    async def create(session: dict):
+        db = get_db()
+        return await db.chat_sessions.insert_one(session)
+
+    @staticmethod
+    async def find(session_id: str, email: str):
+        try:
+            oid = ObjectId(session_id)
+        except (InvalidId, TypeError):
+            return None
+        db = get_db()
+        return await db.chat_sessions.find_one({"_id": oid, "user_email": email})
+
+    @staticmethod
+    async def ensure_indexes():
+        db = get_db()
+        await db.chat_turns.create_index([("session_id", 1), ("index", 1)], unique=True)
+
+    @staticmethod
+    async def list_turns(session_id: ObjectId, start: int = 0):
+        db = get_db()
+        cursor = db.chat_turns.find(
+            {"session_id": session_id, "index": {"$gte": start}},
+            {"_id": 0, "session_id": 0},
+        ).sort("index", 1)
+        return await cursor.to_list(length=None)
+
+    @staticmethod
+    async def append_turns(
+        session: dict,
+        next_index: int,
+        turns: list[dict],
+        summary: str,
+        summarized_turns: int,
+        token_ratio: float,
+    ) -> bool:
+        # Turns are written first: the unique (session_id, index) index rejects
+        # a concurrent writer that read the same tail. The header is updated
+        # afterwards, so a crash in between leaves stored turns that the next
+        # request still reads (the window is derived from chat_turns), never
+        # a header that counts turns which were not saved.
+        db = get_db()
+        try:
+            await db.chat_turns.insert_many(
+                [
+                    {**turn, "session_id": session["_id"], "index": next_index + offset}
+                    for offset, turn in enumerate(turns)
+                ]
+            )
+        except DuplicateKeyError:
+            return False
+        result = await db.chat_sessions.update_one(
+            {"_id": session["_id"], "summarized_turns": session.get("summarized_turns", 0)},
+            {
+                "$set": {
+                    "summary": summary,
+                    "summarized_turns": summarized_turns,
+                    "turn_count": next_index + len(turns),
+                    "token_ratio": token_ratio,
+                }
+            },
+        )
+        return bool(result.matched_count)
+
+
+class DietPlanRepo:
+    @staticmethod
+    async def upsert(plan: dict):
+        db = get_db()
+        return await db.diet_plans.update_one(
+            {"diet_type": plan["diet_type"], "language": plan["language"]},
+            {"$set": plan},
+            upsert=True,
+        )
+
+    @staticmethod
+    async def list_all():
+        db = get_db()
+        return await db.diet_plans.find({}, {"_id": 0}).to_list(length=None)
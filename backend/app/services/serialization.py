@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import Response
+
+# Datetimes are stored as naive UTC BSON dates and rendered as ISO 8601 with a
+# trailing "Z", matching the strings the API has always returned.
+_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY
+
+
+def parse_datetime(value: datetime | str | None) -> datetime | None:
+    # Documents written before the switch to BSON dates hold ISO strings until
+    # `python -m backend.app.services.migrate_datetimes` has been run.
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value.replace("Z", ""))
+
+
+def _default(obj: Any):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class JSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,133 @@
+"""Check and benchmark the local pallor screening engine.
+
+Run from the repo root (pin NumPy to one core to get a per-core figure):
+
+    OMP_NUM_THREADS=1 python -m backend.benchmarks.pallor
+"""
+
+import argparse
+import asyncio
+import io
+import time
+import timeit
+
+import numpy as np
+from PIL import Image
+
+from backend.app.config import settings
+from backend.app.services.pallor import (
+    MicroBatcher,
+    decode_image,
+    extract_features,
+    screen_batch,
+)
+
+
+def _synthetic_image(rng: np.random.Generator, red: float, green: float, blue: float) -> np.ndarray:
+    size = settings.pallor_image_size
+    base = np.array([red, green, blue], dtype=np.float32) * 255.0
+    noise = rng.normal(0.0, 8.0, size=(size, size, 3))
+    return np.clip(base + noise, 0, 255).astype(np.uint8)
+
+
+def _jpeg(image: np.ndarray, size: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(image).resize((size, size)).save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def check_features(rng: np.random.Generator) -> None:
+    red = _synthetic_image(rng, 0.75, 0.30, 0.32)
+    pale = _synthetic_image(rng, 0.80, 0.65, 0.63)
+    dark = np.zeros_like(red)
+
+    batch = extract_features(np.stack([red, pale, dark]))
+    singles = np.concatenate([extract_features(image[None]) for image in (red, pale, dark)])
+    assert np.allclose(batch, singles, atol=1e-6), "batched features differ from single-image"
+    assert batch[0, 0] > batch[1, 0], "erythema index should be higher for red tissue"
+    assert batch[2, -1] == 0.0 and np.isfinite(batch).all(), "fully masked image must stay finite"
+
+    skin = _synthetic_image(rng, 0.80, 0.60, 0.45)
+    skin_coverage = extract_features(skin[None])[0, -1]
+    assert skin_coverage < 0.15, "skin tone should fall outside the tissue mask"
+
+    red_result, pale_result, dark_result = screen_batch([red, pale, dark])
+    assert red_result["pallor_score"] < pale_result["pallor_score"], "pale image should score higher"
+    assert dark_result["status"] == "rejected" and "pallor_score" not in dark_result
+    if not red_result["calibrated"]:
+        assert "anemia_risk" not in red_result, "heuristic scores must not carry a risk level"
+
+
+async def check_batcher() -> None:
+    calls = []
+
+    def handler(items):
+        calls.append(len(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(handler, max_size=16, max_wait_ms=5)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(50)))
+    assert results == [i * 2 for i in range(50)], "results must map back to their requests"
+    assert max(calls) <= 16 and len(calls) < 50, f"requests were not grouped: {calls}"
+
+    def failing(items):
+        raise RuntimeError("boom")
+
+    batcher = MicroBatcher(failing, max_size=4, max_wait_ms=5)
+    outcomes = await asyncio.gather(*(batcher.submit(i) for i in range(4)), return_exceptions=True)
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes), outcomes
+
+    batcher = MicroBatcher(lambda items: items[:-1], max_size=4, max_wait_ms=5)
+    outcomes = await asyncio.wait_for(
+        asyncio.gather(*(batcher.submit(i) for i in range(4)), return_exceptions=True), 1.0
+    )
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes), outcomes
+
+
+async def _batcher_throughput(images: list[np.ndarray], concurrency: int) -> float:
+    batcher = MicroBatcher(
+        screen_batch,
+        max_size=settings.pallor_batch_size,
+        max_wait_ms=settings.pallor_batch_wait_ms,
+    )
+    queue = list(images)
+
+    async def client():
+        while queue:
+            await batcher.submit(queue.pop())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return len(images) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=2000)
+    parser.add_argument("--upload-size", type=int, default=640)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    check_features(rng)
+    asyncio.run(check_batcher())
+    print("checks passed")
+
+    images = [
+        _synthetic_image(rng, *rng.uniform([0.6, 0.25, 0.25], [0.85, 0.7, 0.7]))
+        for _ in range(args.images)
+    ]
+    upload = _jpeg(images[0], args.upload_size)
+
+    decode = min(timeit.repeat(lambda: decode_image(upload), number=50, repeat=5)) / 50
+    print(f"decode {args.upload_size}px JPEG: {1 / decode:>10.0f} images/s")
+    for size in (1, 32, 64):
+        batch = images[:size]
+        elapsed = min(timeit.repeat(lambda: screen_batch(batch), number=20, repeat=5)) / 20
+        print(f"screen_batch (batch {size:>2}): {size / elapsed:>10.0f} images/s")
+    rate = asyncio.run(_batcher_throughput(images, args.concurrency))
+    print(f"micro-batcher ({args.concurrency} clients): {rate:>8.0f} images/s")
+
+
+if __name__ == "__main__":
+    main()
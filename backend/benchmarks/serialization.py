@@ -0,0 +1,93 @@
+"""Compare response serialization cost for large history and export payloads.
+
+Run from the repo root:
+
+    python -m backend.benchmarks.serialization
+"""
+
+import argparse
+import json
+import random
+import timeit
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+from backend.app.services.serialization import dumps
+
+
+def _cbc_report(index: int, start: datetime) -> dict:
+    return {
+        "_id": ObjectId(),
+        "user_email": "user@example.com",
+        "hemoglobin": round(random.uniform(8, 16), 1),
+        "rbc": round(random.uniform(3.5, 6), 2),
+        "hematocrit": round(random.uniform(30, 50), 1),
+        "mcv": round(random.uniform(70, 100), 1),
+        "mch": round(random.uniform(22, 34), 1),
+        "mchc": round(random.uniform(30, 36), 1),
+        "rdw": round(random.uniform(11, 18), 1),
+        "wbc": round(random.uniform(4, 11), 1),
+        "platelets": round(random.uniform(150, 400)),
+        "lab": "City Diagnostics",
+        "report_date": (start + timedelta(days=index)).date().isoformat(),
+        "created_at": start + timedelta(days=index),
+    }
+
+
+def _symptom_entry(index: int, start: datetime) -> dict:
+    return {
+        "_id": ObjectId(),
+        "user_email": "user@example.com",
+        "symptoms": {"fatigue": index % 5, "dizziness": index % 3, "pale_skin": bool(index % 2)},
+        "created_at": start + timedelta(hours=index),
+    }
+
+
+def _legacy(content):
+    # Previous path: stringify _id and datetimes up front, then FastAPI's
+    # jsonable_encoder followed by stdlib json.dumps.
+    def convert(doc: dict) -> dict:
+        doc = dict(doc)
+        doc["_id"] = str(doc["_id"])
+        doc["created_at"] = doc["created_at"].isoformat() + "Z"
+        return doc
+
+    if isinstance(content, dict):
+        content = {key: [convert(doc) for doc in value] for key, value in content.items()}
+    encoded = jsonable_encoder(content)
+    return json.dumps(
+        encoded, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(0)
+    start = datetime(2024, 1, 1)
+    payloads = {
+        "history": {"items": [_cbc_report(i, start) for i in range(args.items)]},
+        "export": {
+            "cbc_reports": [_cbc_report(i, start) for i in range(args.items)],
+            "symptoms": [_symptom_entry(i, start) for i in range(args.items)],
+        },
+    }
+
+    print(f"{'payload':<10}{'bytes':>12}{'legacy ms':>12}{'orjson ms':>12}{'speedup':>10}")
+    for name, payload in payloads.items():
+        legacy = min(timeit.repeat(lambda: _legacy(payload), number=1, repeat=args.repeat))
+        fast = min(timeit.repeat(lambda: dumps(payload), number=1, repeat=args.repeat))
+        size = len(dumps(payload))
+        print(
+            f"{name:<10}{size:>12}{legacy * 1000:>12.2f}{fast * 1000:>12.2f}"
+            f"{legacy / fast:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -107,15 +107,29 @@ export const api = {
       method: "POST",
       body: JSON.stringify({ message }),
     }),
+  createChatSession: () =>
+    request<{ status: string; session_id: string }>("/api/ai/chat/sessions", {
+      method: "POST",
+    }),
+  sendChatTurn: (sessionId: string, message: string) =>
+    request<{
+      reply: string;
+      prompt_tokens: number;
+      window_turns: number;
+      summarized_turns: number;
+    }>(`/api/ai/chat/sessions/${encodeURIComponent(sessionId)}`, {
+      method: "POST",
+      body: JSON.stringify({ message }),
+    }),
   summary: (context: string) =>
     request<{ summary: string }>("/api/ai/summary", {
       method: "POST",
       body: JSON.stringify({ context }),
     }),
-  diet: (dietType: string, notes?: string) =>
-    request<{ plan: string }>("/api/ai/diet", {
+  diet: (dietType: string, notes?: string, language?: string) =>
+    request<{ plan: string; source?: string }>("/api/ai/diet", {
       method: "POST",
-      body: JSON.stringify({ diet_type: dietType, notes }),
+      body: JSON.stringify({ diet_type: dietType, notes, language }),
     }),
   translate: (text: string, targetLanguage: string) =>
     request<{ translated: string }>("/api/ai/translate", {
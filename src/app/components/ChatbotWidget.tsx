@@ -1,6 +1,7 @@
-import { useMemo, useState } from "react";
+import { useMemo, useRef, useState } from "react";
 import { Button } from "./ui/button";
 import { api } from "../api/client";
+import { getAccessToken } from "../auth/store";
 
 type ChatMessage = {
   role: "user" | "ai";
@@ -45,8 +46,28 @@ export function ChatbotWidget() {
     },
   ]);
 
+  const sessionId = useRef<string | null>(null);
+
+  const sessionReply = async (text: string) => {
+    if (!sessionId.current) {
+      const session = await api.createChatSession();
+      sessionId.current = session.session_id;
+    }
+    try {
+      const res = await api.sendChatTurn(sessionId.current, text);
+      return res.reply;
+    } catch (err) {
+      // Session may have expired or belong to a previous login; start over next time.
+      sessionId.current = null;
+      throw err;
+    }
+  };
+
   const replyFor = async (text: string) => {
     try {
+      if (getAccessToken()) {
+        return await sessionReply(text);
+      }
       const res = await api.chat(text);
       return res.reply;
     } catch {
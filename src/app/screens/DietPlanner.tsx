@@ -14,6 +14,8 @@ export function DietPlanner() {
   const [language, setLanguage] = useState<SupportedLanguage>("English");
   const [translatedAdvice, setTranslatedAdvice] = useState(false);
   const [aiPlan, setAiPlan] = useState<string | null>(null);
+  const [planDiet, setPlanDiet] = useState<"veg" | "nonveg">("nonveg");
+  const [planSource, setPlanSource] = useState<string | null>(null);
   const [translatedPlan, setTranslatedPlan] = useState<string | null>(null);
   const [planLoading, setPlanLoading] = useState(false);
 
@@ -85,12 +87,14 @@ export function DietPlanner() {
   const generatePlan = async () => {
     setPlanLoading(true);
     setAiPlan(null);
-    const notes = dietType === "veg"
-      ? "Focus on lentils, spinach, tofu, and vitamin C sources."
-      : "Prioritize lean red meat, eggs, and leafy greens with vitamin C.";
+    setTranslatedAdvice(false);
+    setTranslatedPlan(null);
+    setPlanDiet(dietType);
+    setPlanSource(null);
     try {
-      const res = await api.diet(dietType, notes);
+      const res = await api.diet(dietType);
       setAiPlan(res.plan);
+      setPlanSource(res.source ?? null);
     } catch {
       const plan =
         dietType === "veg"
@@ -166,8 +170,14 @@ export function DietPlanner() {
                   setTranslatedAdvice(next);
                   if (next && aiPlan && language !== "English") {
                     try {
-                      const res = await api.translate(aiPlan, language);
-                      setTranslatedPlan(res.translated);
+                      if (planSource === "catalog") {
+                        // Catalog translations are made from the same English plan.
+                        const res = await api.diet(planDiet, undefined, language);
+                        setTranslatedPlan(res.plan);
+                      } else {
+                        const res = await api.translate(aiPlan, language);
+                        setTranslatedPlan(res.translated);
+                      }
                     } catch {
                       setTranslatedPlan(`[${language}] ${aiPlan}`);
                     }